@@ -0,0 +1,118 @@
+import asyncio
+import os
+import signal
+import time
+import urllib.request
+from typing import Optional
+from playwright.async_api import async_playwright, Playwright, Browser
+
+# Single Chromium instance shared by every verification.
+# Each request gets its own BrowserContext, which is far cheaper than a browser launch.
+# With several workers, Chromium runs in its own host process (`python browser_manager.py`,
+# started by main.py), which sets BROWSER_CDP_URL so every worker attaches to it over CDP
+# and no worker owns it. Without BROWSER_CDP_URL, each process launches a private browser.
+# Concurrent contexts per worker process. Workers attached to the hosted browser each get
+# this many, so it can hold WORKERS * PW_CONCURRENCY contexts in total.
+MAX_CONTEXTS = int(os.getenv("PW_CONCURRENCY", "8"))
+CDP_PORT = int(os.getenv("BROWSER_CDP_PORT", "9222"))  # Port the host process listens on
+HOST_ENDPOINT = f"http://127.0.0.1:{CDP_PORT}"
+BROWSER_ARGS = ['--no-sandbox', '--disable-blink-features=AutomationControlled']
+
+_pw: Optional[Playwright] = None
+_browser: Optional[Browser] = None
+_owns_browser = False  # True only for a private browser this process launched
+_context_semaphore = asyncio.Semaphore(MAX_CONTEXTS)
+_launch_lock = asyncio.Lock()
+
+async def _connect():
+    """Attach to the browser host named by BROWSER_CDP_URL, or launch a private browser"""
+    global _pw, _browser, _owns_browser
+    if _browser is not None:
+        return
+
+    cdp_url = os.getenv("BROWSER_CDP_URL")
+    _pw = await async_playwright().start()
+    try:
+        _browser = None
+        if cdp_url:
+            try:
+                _browser = await _pw.chromium.connect_over_cdp(cdp_url, timeout=5000)
+                _owns_browser = False
+            except Exception as e:
+                print(f"Error connecting to browser host at {cdp_url}, launching a private browser: {e}")
+        if _browser is None:
+            # A browser of our own, without a debugging port to compete for
+            _browser = await _pw.chromium.launch(headless=True, args=BROWSER_ARGS)
+            _owns_browser = True
+    except Exception:
+        await _pw.stop()
+        _pw = None
+        raise
+
+async def startup():
+    """Start the shared browser at app startup without making the app depend on it.
+
+    Format validation, state info and requests-mode states work without Chromium,
+    so a failed launch is only logged; get_browser() retries on the next Playwright scrape.
+    """
+    try:
+        await _connect()
+    except Exception as e:
+        print(f"Error starting shared browser, will retry on first use: {e}")
+
+async def shutdown():
+    """Close a private browser, or just disconnect from the shared host"""
+    global _pw, _browser
+    if _browser is not None:
+        # Closing the host's browser would kill every other worker's contexts
+        if _owns_browser:
+            await _browser.close()
+        _browser = None
+    if _pw is not None:
+        await _pw.stop()
+        _pw = None
+
+async def get_browser() -> Browser:
+    """Get the shared browser, reconnecting if startup was skipped or the connection dropped"""
+    if _browser is None or not _browser.is_connected():
+        async with _launch_lock:
+            if _browser is None or not _browser.is_connected():
+                await shutdown()
+                await _connect()
+    return _browser
+
+def context_slot() -> asyncio.Semaphore:
+    """Semaphore capping this worker's concurrent contexts"""
+    return _context_semaphore
+
+async def host_browser():
+    """Run the shared Chromium with a CDP endpoint until the process is terminated"""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(
+            headless=True,
+            args=BROWSER_ARGS + [f'--remote-debugging-port={CDP_PORT}']
+        )
+        print(f"Shared browser listening on {HOST_ENDPOINT}")
+        try:
+            await stop.wait()
+        finally:
+            await browser.close()
+
+def wait_for_host(timeout: float = 30.0) -> bool:
+    """Block until the browser host answers on its CDP port"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{HOST_ENDPOINT}/json/version", timeout=2):
+                return True
+        except OSError:
+            time.sleep(0.5)
+    return False
+
+if __name__ == "__main__":
+    asyncio.run(host_browser())
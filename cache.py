@@ -1,12 +1,35 @@
+import asyncio
 import json
 import hashlib
 from datetime import datetime, timedelta
 import os
-from typing import Optional, Any
+from typing import Optional, Any, List, Tuple
 
-# Simple file-based cache (consider using Redis for production)
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Redis is optional; fall back to the file cache
+    aioredis = None
+
+# Redis cache shared by all workers when REDIS_URL is set, otherwise a simple file-based cache.
+# File I/O runs in a worker thread so it never blocks the event loop.
+REDIS_URL = os.getenv("REDIS_URL")
 CACHE_DIR = "cache"
 CACHE_DURATION_HOURS = 24  # Cache results for 24 hours
+CACHE_KEY_PREFIX = "lic:"
+# Verification results and the short-lived error results written under "error_" + key
+CACHE_KEY_PATTERNS = (f"{CACHE_KEY_PREFIX}*", f"error_{CACHE_KEY_PREFIX}*")
+SCAN_PAGE_SIZE = 500
+
+_redis = aioredis.from_url(REDIS_URL, decode_responses=True) if (REDIS_URL and aioredis) else None
+
+def make_cache_key(state: str, license_number: Optional[str], business_name: Optional[str], screenshot: bool = False) -> str:
+    """Build the cache key for a verification.
+
+    The state is wrapped in a hash tag so all keys for one state land on the same Redis Cluster shard.
+    Results with screenshots are cached separately from plain ones.
+    """
+    key = f"{CACHE_KEY_PREFIX}{{{state}}}:{license_number}:{business_name}"
+    return f"{key}:screenshot" if screenshot else key
 
 def ensure_cache_dir():
     """Ensure cache directory exists"""
@@ -18,73 +41,159 @@ def get_cache_key(*args, **kwargs) -> str:
     key_data = f"{args}{kwargs}"
     return hashlib.md5(key_data.encode()).hexdigest()
 
-def get_cached_result(*args, **kwargs) -> Optional[Any]:
-    """Get cached result if it exists and is not expired"""
+def _cache_file(cache_key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{hashlib.md5(cache_key.encode()).hexdigest()}.json")
+
+def _read_file_cache(cache_key: str) -> Optional[Any]:
+    """Read a result from the file cache if it exists and is not expired"""
     ensure_cache_dir()
-    
-    cache_key = get_cache_key(*args, **kwargs)
-    cache_file = os.path.join(CACHE_DIR, f"{cache_key}.json")
-    
+
+    cache_file = _cache_file(cache_key)
+
     if not os.path.exists(cache_file):
         return None
-    
+
     try:
         with open(cache_file, 'r') as f:
             cached_data = json.load(f)
-        
+
         # Check if cache has expired
         cached_time = datetime.fromisoformat(cached_data["timestamp"])
-        if datetime.now() - cached_time > timedelta(hours=CACHE_DURATION_HOURS):
+        ttl = cached_data.get("ttl_seconds", CACHE_DURATION_HOURS * 3600)
+        if datetime.now() - cached_time > timedelta(seconds=ttl):
             # Cache expired, remove file
             os.remove(cache_file)
             return None
-        
+
         return cached_data["result"]
-        
+
     except (json.JSONDecodeError, KeyError, ValueError):
         # Invalid cache file, remove it
         if os.path.exists(cache_file):
             os.remove(cache_file)
         return None
 
-def store_result(cache_key_args, result: Any):
-    """Store result in cache"""
+def _write_file_cache(cache_key: str, result: Any, ttl_seconds: int):
+    """Write a result to the file cache"""
     ensure_cache_dir()
-    
-    if isinstance(cache_key_args, str):
-        cache_key = hashlib.md5(cache_key_args.encode()).hexdigest()
-    else:
-        cache_key = get_cache_key(cache_key_args)
-    
-    cache_file = os.path.join(CACHE_DIR, f"{cache_key}.json")
-    
+
     cache_data = {
         "timestamp": datetime.now().isoformat(),
+        "ttl_seconds": ttl_seconds,
         "result": result
     }
-    
+
     try:
-        with open(cache_file, 'w') as f:
+        with open(_cache_file(cache_key), 'w') as f:
             json.dump(cache_data, f, indent=2, default=str)
     except Exception as e:
         print(f"Error storing cache: {e}")
 
-def clear_cache():
-    """Clear all cached results"""
+def _write_file_entries(entries: List[Tuple[str, Any, int]]):
+    """Write several results to the file cache"""
+    for cache_key, result, ttl_seconds in entries:
+        _write_file_cache(cache_key, result, ttl_seconds)
+
+async def get_cached_result(cache_key: str) -> Optional[Any]:
+    """Get cached result if it exists and is not expired"""
+    if _redis is not None:
+        try:
+            raw = await _redis.get(cache_key)
+        except Exception as e:
+            print(f"Error reading cache: {e}")
+            return None
+        return json.loads(raw) if raw else None
+    return await asyncio.to_thread(_read_file_cache, cache_key)
+
+async def store_result(cache_key: str, result: Any, ttl_seconds: int = CACHE_DURATION_HOURS * 3600):
+    """Store result in cache"""
+    if _redis is not None:
+        try:
+            await _redis.set(cache_key, json.dumps(result, default=str), ex=ttl_seconds)
+        except Exception as e:
+            print(f"Error storing cache: {e}")
+        return
+    await asyncio.to_thread(_write_file_cache, cache_key, result, ttl_seconds)
+
+async def get_cached_results(cache_keys: List[str]) -> List[Optional[Any]]:
+    """Get cached results for many keys at once, in the same order as cache_keys"""
+    if not cache_keys:
+        return []
+    if _redis is not None:
+        try:
+            raw_values = await _redis.mget(cache_keys)
+        except Exception as e:
+            print(f"Error reading cache: {e}")
+            return [None] * len(cache_keys)
+        return [json.loads(raw) if raw else None for raw in raw_values]
+    return await asyncio.to_thread(lambda: [_read_file_cache(cache_key) for cache_key in cache_keys])
+
+async def store_results(entries: List[Tuple[str, Any, int]]):
+    """Store many (cache_key, result, ttl_seconds) entries at once"""
+    if not entries:
+        return
+    if _redis is not None:
+        try:
+            async with _redis.pipeline(transaction=False) as pipe:
+                for cache_key, result, ttl_seconds in entries:
+                    pipe.set(cache_key, json.dumps(result, default=str), ex=ttl_seconds)
+                await pipe.execute()
+        except Exception as e:
+            print(f"Error storing cache: {e}")
+        return
+    await asyncio.to_thread(_write_file_entries, entries)
+
+def _clear_file_cache():
+    """Remove every file cache entry"""
     if os.path.exists(CACHE_DIR):
         for filename in os.listdir(CACHE_DIR):
             if filename.endswith('.json'):
                 os.remove(os.path.join(CACHE_DIR, filename))
 
-def get_cache_stats():
-    """Get cache statistics"""
+def _file_cache_stats():
+    """Count file cache entries and their size on disk"""
     if not os.path.exists(CACHE_DIR):
         return {"cached_items": 0, "cache_size_mb": 0}
-    
+
     files = [f for f in os.listdir(CACHE_DIR) if f.endswith('.json')]
     total_size = sum(os.path.getsize(os.path.join(CACHE_DIR, f)) for f in files)
-    
+
     return {
         "cached_items": len(files),
         "cache_size_mb": round(total_size / (1024 * 1024), 2)
     }
+
+async def _scan_pages(match: str):
+    """Yield this app's Redis keys matching a pattern, one SCAN page at a time"""
+    cursor = 0
+    while True:
+        cursor, keys = await _redis.scan(cursor, match=match, count=SCAN_PAGE_SIZE)
+        if keys:
+            yield keys
+        if cursor == 0:
+            break
+
+async def clear_cache():
+    """Clear all cached results"""
+    if _redis is not None:
+        for match in CACHE_KEY_PATTERNS:
+            async for keys in _scan_pages(match):
+                await _redis.unlink(*keys)
+        return
+
+    await asyncio.to_thread(_clear_file_cache)
+
+async def get_cache_stats():
+    """Get cache statistics"""
+    if _redis is not None:
+        cached_items = 0
+        for match in CACHE_KEY_PATTERNS:
+            async for keys in _scan_pages(match):
+                cached_items += len(keys)
+        memory = await _redis.info("memory")
+        return {
+            "cached_items": cached_items,
+            "cache_size_mb": round(memory.get("used_memory", 0) / (1024 * 1024), 2)
+        }
+
+    return await asyncio.to_thread(_file_cache_stats)
@@ -1,5 +1,7 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, validator
 from typing import Optional, List, Dict, Any
 from scraper import (
@@ -9,14 +11,36 @@ from scraper import (
     get_supported_states, 
     get_state_info,
     normalize_license_number,
+    start_http_session,
+    close_http_session,
+    start_prewarm,
+    stop_prewarm,
     STATE_CONFIGS
 )
+from screenshot_store import close_screenshot_store
+import browser_manager
 import re
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Keep the shared Playwright browser, pooled HTTP session and S3 client for the whole process"""
+    await browser_manager.startup()
+    await start_http_session()
+    await start_prewarm()
+    try:
+        yield
+    finally:
+        await stop_prewarm()
+        await browser_manager.shutdown()
+        await close_http_session()
+        await close_screenshot_store()
+
 app = FastAPI(
     title="Contractor License Verification API", 
     version="4.0",
-    description="Real-time contractor license verification across all US states"
+    description="Real-time contractor license verification across all US states",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware for web applications
@@ -32,6 +56,7 @@ class LicenseRequest(BaseModel):
     state: str
     license_number: Optional[str] = None
     business_name: Optional[str] = None
+    screenshot: bool = False  # Capture screenshot evidence (slower, larger response)
     
     @validator('state')
     def validate_state(cls, v):
@@ -88,7 +113,8 @@ async def verify(request: LicenseRequest):
         result = await verify_license(
             request.state, 
             request.license_number, 
-            request.business_name
+            request.business_name,
+            request.screenshot
         )
         return result
     except Exception as e:
@@ -98,8 +124,7 @@ async def verify(request: LicenseRequest):
 async def verify_multiple(batch: BatchRequest):
     """Verify multiple contractor licenses in batch"""
     try:
-        queries = [r.dict() for r in batch.requests]
-        results = await verify_batch(queries)
+        results = await verify_batch(batch.requests)
         
         # Add summary statistics
         summary = {
@@ -148,7 +173,8 @@ async def search_license(
     state: str = Query(..., description="2-letter state code"),
     license_number: Optional[str] = Query(None, description="License number to verify"),
     business_name: Optional[str] = Query(None, description="Business name to search"),
-    format_only: bool = Query(False, description="Only validate format, don't verify")
+    format_only: bool = Query(False, description="Only validate format, don't verify"),
+    screenshot: bool = Query(False, description="Capture screenshot evidence")
 ):
     """Search/verify license via GET request (for easy testing)"""
     
@@ -156,7 +182,7 @@ async def search_license(
         return validate_license_format(state, license_number)
     
     try:
-        result = await verify_license(state, license_number, business_name)
+        result = await verify_license(state, license_number, business_name, screenshot)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -194,5 +220,33 @@ async def not_found_handler(request, exc):
     return {"error": "Resource not found", "detail": str(exc)}
 
 if __name__ == "__main__":
+    import os
+    import subprocess
+    import sys
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=10000)
+    workers = int(os.getenv("WORKERS", str(os.cpu_count() or 1)))
+    # Workers share one Chromium hosted in a side process and attach over CDP (see browser_manager)
+    host = None
+    if workers > 1 and "BROWSER_CDP_URL" not in os.environ:
+        host = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "browser_manager.py")])
+        if browser_manager.wait_for_host():
+            # Inherited by the worker processes uvicorn spawns
+            os.environ["BROWSER_CDP_URL"] = browser_manager.HOST_ENDPOINT
+        else:
+            print("Shared browser host did not start, workers will launch their own browsers")
+            host.terminate()
+            host.wait()
+            host = None
+    try:
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=10000,
+            loop="uvloop",
+            http="httptools",
+            workers=workers
+        )
+    finally:
+        if host is not None:
+            host.terminate()
+            host.wait()
@@ -1,12 +1,96 @@
 import re
+import html
 import asyncio
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
-import aiohttp
-from cache import get_cached_result, store_result
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from browser_manager import get_browser, context_slot
+from screenshot_store import upload_screenshot
+import httpx
+from cache import get_cached_result, get_cached_results, store_result, store_results, make_cache_key, CACHE_DURATION_HOURS
 from typing import Optional, Dict, Any
 import base64
-from typing import List, Dict, Any
+import os
+from typing import List, Dict, Any, Tuple, Union
+
+# Pooled HTTP/2 client shared by all requests-mode verifications (see start_http_session)
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "200"))
+HTTP_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_KEEPALIVE_CONNECTIONS", "50"))
+HTTP_CONCURRENCY = int(os.getenv("HTTP_CONCURRENCY", "50"))  # In-flight requests-mode verifications
+HTTP_SEM = asyncio.Semaphore(HTTP_CONCURRENCY)
+# Per-state cap on in-flight scrapes, so a large batch for one state doesn't flood its site
+STATE_CONCURRENCY = int(os.getenv("STATE_CONCURRENCY", "2"))
+_state_semaphores: Dict[str, asyncio.Semaphore] = {}
+_session: Optional[httpx.AsyncClient] = None
+
+CACHE_TTL_SECONDS = CACHE_DURATION_HOURS * 3600
+ERROR_CACHE_SECONDS = 3600  # Failed verifications are cached briefly so retries can succeed
+
+BATCH_CHUNK = int(os.getenv("BATCH_CHUNK", "20"))  # Max concurrent verifications per batch
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+REQUEST_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate'
+}
+
+# Fallback selectors for states without a known search form
+GENERIC_LICENSE_INPUT = "input[type='text'], input[name*='license'], input[id*='license']"
+GENERIC_SEARCH_BUTTON = "input[type='submit'], button[type='submit'], input[value*='Search'], button:has-text('Search')"
+# Images, fonts and media by URL; only these requests are routed through Python, the rest go straight out
+BLOCKED_RESOURCE_PATTERN = re.compile(r"\.(png|jpe?g|gif|webp|svg|ico|woff2?|ttf|otf|mp4|webm)(\?|$)", re.I)
+
+# Runs in the page: {field: selector} -> {field: trimmed text or null}
+EXTRACT_FIELDS_JS = """(selectors) => Object.fromEntries(
+    Object.entries(selectors).map(([field, selector]) => {
+        const element = document.querySelector(selector);
+        return [field, element ? element.textContent.trim() : null];
+    })
+)"""
+
+# Runs in the page: label/value table rows -> {lowercased label: value}
+EXTRACT_TABLE_JS = """() => Object.fromEntries(
+    Array.from(document.querySelectorAll("tr"))
+        .map((row) => row.querySelectorAll("td"))
+        .filter((cells) => cells.length >= 2)
+        .map((cells) => [cells[0].textContent.toLowerCase().trim(), cells[1].textContent.trim()])
+)"""
+
+# Status keywords in priority order; the first pattern that matches anywhere wins
+STATUS_PATTERNS = (
+    # Whole words only, so "inactive", "invalid" and ASP.NET's __EVENTVALIDATION don't read as Active
+    ("Active", re.compile(r"\b(?:active|valid|current|good standing)\b", re.I)),
+    ("Expired", re.compile(r"expired|inactive|lapsed", re.I)),
+    ("Invalid", re.compile(r"invalid|not found|no results|no license", re.I)),
+    ("Suspended", re.compile(r"suspended|revoked|cancelled", re.I)),
+)
+# Same keywords for scanning raw response bytes without decoding
+STATUS_BYTES_PATTERNS = tuple((status, re.compile(pattern.pattern.encode(), re.I)) for status, pattern in STATUS_PATTERNS)
+ACTIVE_BYTES_PATTERN = STATUS_BYTES_PATTERNS[0][1]
+MAX_RESPONSE_BYTES = 64 * 1024  # Stop reading requests-mode responses past this size
+# Detail pages (e.g. ASP.NET with a large __VIEWSTATE) are read until every field element has
+# arrived, up to this larger cap
+MAX_DETAIL_RESPONSE_BYTES = 1024 * 1024
+DETAIL_RESCAN_BYTES = 4096  # Bytes of already-read body rescanned so an element split across chunks still matches
+NAME_PATTERNS = [re.compile(pattern, re.I) for pattern in (
+    r"business name[:\s]+([^<\n\r]+)",
+    r"company name[:\s]+([^<\n\r]+)",
+    r"contractor name[:\s]+([^<\n\r]+)",
+    r"name[:\s]+([^<\n\r]+)"
+)]
+DATE_PATTERNS = [re.compile(pattern, re.I) for pattern in (
+    r"expir[a-z]*[:\s]+(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})",
+    r"expires?[:\s]+(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})",
+    r"valid through[:\s]+(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})"
+)]
+
+PREWARM = os.getenv("PREWARM", "1") == "1"  # Warm connections to every requests-mode state site at startup
+PREWARM_CONCURRENCY = int(os.getenv("PREWARM_CONCURRENCY", "4"))  # Kept small so warmups don't crowd out real requests
+_prewarm_semaphore = asyncio.Semaphore(PREWARM_CONCURRENCY)
+_prewarm_task: Optional[asyncio.Task] = None
+
+# Verifications currently running, keyed by cache key, so duplicate requests share one scrape
+_inflight: Dict[str, asyncio.Future] = {}
 
 
 # Complete state configurations with license formats and verification URLs
@@ -43,6 +127,7 @@ STATE_CONFIGS = {
         "format": "8 digits, leading zeros allowed",
         "url": "http://aclb2.arkansas.gov/clbsearch.php?_ga=2.5731125.765643424.1566368253-1789997821.1562103904",
         "method": "requests",
+        "form_data": {"license_number": "{license_number}", "search": "Search"},
         "notes": "Session ID stripped from link"
     },
     "CA": {
@@ -50,8 +135,28 @@ STATE_CONFIGS = {
         "example": "927123",
         "type": "CSLB Contractor",
         "format": "6 to 8 digits",
-        "url": "https://www.cslb.ca.gov/onlineservices/checklicenseII/checklicense.aspx",
-        "method": "playwright",
+        "url": "https://www.cslb.ca.gov/OnlineServices/CheckLicenseII/LicenseDetail.aspx",
+        "method": "requests",
+        "http_method": "GET",
+        "form_data": {"LicNum": "{license_number}"},
+        "fallback_method": "playwright",
+        "fallback_url": "https://www.cslb.ca.gov/onlineservices/checklicenseII/checklicense.aspx",
+        "referer": "https://www.cslb.ca.gov/",
+        # Elements of the LicenseDetail.aspx page; the license number and status mark a real detail page
+        "detail_patterns": {
+            "license_number": r'id="MainContent_LicNum"[^>]*>(.*?)</span>',
+            "status": r'id="MainContent_Status"[^>]*>(.*?)</span>',
+            "business_name": r'id="MainContent_BusInfo"[^>]*>(.*?)<br',
+            "expires": r'id="MainContent_ExpDt"[^>]*>(.*?)</span>'
+        },
+        "license_input": "#ctl00_ContentPlaceHolder1_txtLicnum",
+        "search_button": "#ctl00_ContentPlaceHolder1_btnSearch",
+        # The same detail-page elements as detail_patterns, which the search form leads to
+        "result_selectors": {
+            "status": "#MainContent_Status",
+            "business_name": "#MainContent_BusInfo",
+            "expires": "#MainContent_ExpDt"
+        },
         "notes": "Bot detection; use ModHeader with Referrer spoof"
     },
     "CO": {
@@ -87,6 +192,7 @@ STATE_CONFIGS = {
         "format": "Prefix CGC + 7 digits",
         "url": "https://www.myfloridalicense.com/wl11.asp?mode=0&SID=",
         "method": "requests",
+        "form_data": {"licnbr": "{license_number}", "Submit": "Search"},
         "notes": "Session-based link"
     },
     "GA": {
@@ -171,7 +277,8 @@ STATE_CONFIGS = {
         "type": "Home Improvement Commission",
         "format": "Two digit prefix + dash + six digits",
         "url": "https://www.dllr.state.md.us/cgi-bin/ElectronicLicensing/OP_search/OP_search.cgi?calling_app=HIC::HIC_qselect",
-        "method": "requests"
+        "method": "requests",
+        "form_data": {"license_number": "{license_number}", "action": "search"}
     },
     "MA": {
         "regex": r"CSL-\d{6}",
@@ -307,7 +414,10 @@ STATE_CONFIGS = {
         "type": "Construction Contractors Board",
         "format": "Six-digit numeric ID",
         "url": "https://search.ccb.state.or.us/search/",
-        "method": "playwright"
+        "method": "playwright",
+        "license_input": "input[name='license_number']",
+        "search_button": "input[type='submit']",
+        "results_selector": ".search-results, #search-results, .no-results"
     },
     "PA": {
         "regex": r"PA\d{6}",
@@ -355,7 +465,10 @@ STATE_CONFIGS = {
         "type": "Electrical, HVAC, Plumbing",
         "format": "Five or six-digit numeric ID",
         "url": "https://www.tdlr.texas.gov/LicenseSearch/",
-        "method": "playwright"
+        "method": "playwright",
+        "license_input": "#LicenseNumber",
+        "search_button": "#SearchButton",
+        "results_selector": "#SearchResults, .search-results, .no-results"
     },
     "UT": {
         "regex": r"\d{6}-\d{4}",
@@ -387,7 +500,10 @@ STATE_CONFIGS = {
         "type": "Contractor Registration",
         "format": "Three letters + four digits",
         "url": "https://secure.lni.wa.gov/verify/",
-        "method": "playwright"
+        "method": "playwright",
+        "license_input": "input[name='licenseNumber']",
+        "search_button": "input[value='Search']",
+        "results_selector": "#resultsTable, .results, .no-results"
     },
     "WV": {
         "regex": r"WV\d{6}",
@@ -416,6 +532,36 @@ STATE_CONFIGS = {
     }
 }
 
+# Invariant per-state data derived once at import instead of on every verification
+STATE_REGEXES = {state: re.compile(config["regex"]) for state, config in STATE_CONFIGS.items() if config.get("regex")}
+STATE_DETAIL_PATTERNS = {
+    state: {field: re.compile(pattern, re.I | re.S) for field, pattern in config["detail_patterns"].items()}
+    for state, config in STATE_CONFIGS.items() if config.get("detail_patterns")
+}
+# Same patterns for spotting each field element in the raw response bytes
+STATE_DETAIL_BYTES_PATTERNS = {
+    state: {field: re.compile(pattern.pattern.encode(), re.I | re.S) for field, pattern in patterns.items()}
+    for state, patterns in STATE_DETAIL_PATTERNS.items()
+}
+HTML_TAG_PATTERN = re.compile(r"<[^>]+>")
+
+def _form_template(form_data: Dict[str, str]) -> Tuple[Dict[str, str], Tuple[str, ...]]:
+    """Split a form_data config into the template and the fields that take the license number"""
+    return dict(form_data), tuple(field for field, value in form_data.items() if "{license_number}" in value)
+
+DEFAULT_FORM_TEMPLATE = _form_template({"license_number": "{license_number}", "search": "Search"})
+FORM_TEMPLATES = {
+    state: _form_template(config["form_data"])
+    for state, config in STATE_CONFIGS.items()
+    if "form_data" in config
+}
+CONTEXT_HEADERS = {
+    state: {"Referer": config["referer"]}
+    for state, config in STATE_CONFIGS.items()
+    if "referer" in config
+}
+STATE_REQUEST_HEADERS = {state: {**REQUEST_HEADERS, **headers} for state, headers in CONTEXT_HEADERS.items()}
+
 def validate_license_format(state: str, license_number: str) -> Dict[str, Any]:
     """Validate license number format against state requirements"""
     state = state.upper()
@@ -437,7 +583,7 @@ def validate_license_format(state: str, license_number: str) -> Dict[str, Any]:
             "format_info": config
         }
     
-    is_valid = bool(re.match(regex_pattern, license_number))
+    is_valid = bool(STATE_REGEXES[state].match(license_number))
     
     return {
         "valid": is_valid,
@@ -447,178 +593,277 @@ def validate_license_format(state: str, license_number: str) -> Dict[str, Any]:
         "notes": config.get("notes")
     }
 
-async def scrape_with_playwright(state: str, config: Dict, license_number: str, business_name: Optional[str] = None) -> Dict[str, Any]:
+def _new_http_session() -> httpx.AsyncClient:
+    """Build an HTTP/2 client with a large keep-alive connection pool"""
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=HTTP_POOL_SIZE,
+            max_keepalive_connections=HTTP_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=60
+        ),
+        timeout=30.0,
+        follow_redirects=True  # Match the redirect handling of the previous aiohttp session
+    )
+
+async def start_http_session():
+    """Open the pooled HTTP session reused by every requests-mode verification"""
+    global _session
+    if _session is None or _session.is_closed:
+        _session = _new_http_session()
+
+async def close_http_session():
+    """Close the pooled HTTP session"""
+    global _session
+    if _session is not None:
+        await _session.aclose()
+        _session = None
+
+def get_http_session() -> httpx.AsyncClient:
+    """Get the pooled HTTP session, creating it if startup was skipped"""
+    global _session
+    if _session is None or _session.is_closed:
+        _session = _new_http_session()
+    return _session
+
+async def _extract_fields(page, selectors: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """Read the text of several selectors in one round trip to the page (None when missing)"""
+    if not selectors:
+        return {}
+    return await page.evaluate(EXTRACT_FIELDS_JS, selectors)
+
+async def _block_heavy_resources(route):
+    """Abort images, fonts and media; the status text never depends on them"""
+    await route.abort()
+
+async def scrape_with_playwright(state: str, config: Dict, license_number: str, business_name: Optional[str] = None, screenshot: bool = False) -> Dict[str, Any]:
     """Generic Playwright scraping function"""
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=True,
-            args=['--no-sandbox', '--disable-blink-features=AutomationControlled']
-        )
-        
-        # Use different user agents and headers based on state requirements
-        user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        extra_headers = {}
-        
-        if state == "CA":
-            extra_headers['Referer'] = 'https://www.cslb.ca.gov/'
-        
-        context = await browser.new_context(
-            user_agent=user_agent,
-            extra_http_headers=extra_headers
-        )
-        page = await context.new_page()
-        
+    async with context_slot():
+        context = None
         try:
-            await page.goto(config["url"], wait_until="networkidle", timeout=30000)
+            browser = await get_browser()
             
-            # State-specific scraping logic
-            if state == "CA":
-                await page.fill("#ctl00_ContentPlaceHolder1_txtLicnum", license_number)
-                await page.click("#ctl00_ContentPlaceHolder1_btnSearch")
-            elif state == "FL":
-                await page.fill("input[name='licnbr']", license_number)
-                await page.click("input[name='Submit']")
-            elif state == "TX":
-                await page.fill("#LicenseNumber", license_number)
-                await page.click("#SearchButton")
-            elif state == "OR":
-                await page.fill("input[name='license_number']", license_number)
-                await page.click("input[type='submit']")
-            elif state == "WA":
-                await page.fill("input[name='licenseNumber']", license_number)
-                await page.click("input[value='Search']")
+            # Use different user agents and headers based on state requirements
+            context = await browser.new_context(
+                user_agent=USER_AGENT,
+                extra_http_headers=CONTEXT_HEADERS.get(state, {})
+            )
+            await context.route(BLOCKED_RESOURCE_PATTERN, _block_heavy_resources)
+            page = await context.new_page()
+            
+            # The DOM is all we need to fill the form; don't wait for analytics and other late requests
+            await page.goto(config["url"], wait_until="domcontentloaded", timeout=30000)
+            
+            if "license_input" in config:
+                # fill() waits for the input to be visible and editable
+                await page.fill(config["license_input"], license_number)
+                await page.click(config["search_button"])
             else:
                 # Generic approach - look for common input patterns
-                license_inputs = await page.query_selector_all("input[type='text'], input[name*='license'], input[id*='license']")
+                try:
+                    await page.wait_for_selector(GENERIC_LICENSE_INPUT, state="visible", timeout=10000)
+                except PlaywrightTimeoutError:
+                    pass
+                
+                license_inputs = await page.query_selector_all(GENERIC_LICENSE_INPUT)
                 if license_inputs:
                     await license_inputs[0].fill(license_number)
                 
-                search_buttons = await page.query_selector_all("input[type='submit'], button[type='submit'], input[value*='Search'], button:has-text('Search')")
+                search_buttons = await page.query_selector_all(GENERIC_SEARCH_BUTTON)
                 if search_buttons:
                     await search_buttons[0].click()
             
-            # Wait for results
-            await page.wait_for_load_state("networkidle", timeout=15000)
-            
-            # Take screenshot for evidence
-            screenshot_bytes = await page.screenshot(full_page=True)
-            
-            # Extract results - generic approach
-            content = await page.content()
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Determine license status
-            status = "Unknown"
-            business_name_result = business_name or "Unknown"
-            expires = "Unknown"
-            
-            content_lower = content.lower()
-            if any(word in content_lower for word in ["active", "valid", "current", "good standing"]):
-                status = "Active"
-            elif any(word in content_lower for word in ["expired", "inactive", "lapsed"]):
-                status = "Expired"
-            elif any(word in content_lower for word in ["invalid", "not found", "no results", "no license"]):
-                status = "Invalid"
-            elif any(word in content_lower for word in ["suspended", "revoked", "cancelled"]):
-                status = "Suspended"
-            
-            # Try to extract business name if not provided
-            if business_name_result == "Unknown":
-                name_patterns = [
-                    r"business name[:\s]+([^<\n\r]+)",
-                    r"company name[:\s]+([^<\n\r]+)",
-                    r"contractor name[:\s]+([^<\n\r]+)",
-                    r"name[:\s]+([^<\n\r]+)"
-                ]
-                for pattern in name_patterns:
-                    match = re.search(pattern, content_lower)
-                    if match:
-                        business_name_result = match.group(1).strip()
-                        break
-            
-            # Try to extract expiration date
-            date_patterns = [
-                r"expir[a-z]*[:\s]+(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})",
-                r"expires?[:\s]+(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})",
-                r"valid through[:\s]+(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})"
-            ]
-            for pattern in date_patterns:
-                match = re.search(pattern, content_lower)
-                if match:
-                    expires = match.group(1)
-                    break
-            
-            await browser.close()
-            
-            return {
-                "status": status,
-                "license_number": license_number,
-                "business_name": business_name_result,
-                "issuing_authority": f"{state} {config.get('type', 'Licensing Board')}",
-                "expires": expires,
-                "screenshot_data": base64.b64encode(screenshot_bytes).decode('utf-8'),
-                "verified": True,
-                "verification_url": config["url"],
-                "format_valid": validate_license_format(state, license_number)["valid"]
-            }
+            # Wait for results - many searches render them via XHR, or navigate to a results page,
+            # so wait for the state's result element, or for the network to settle when none is known
+            results_selector = config["result_selectors"]["status"] if "result_selectors" in config else config.get("results_selector")
+            try:
+                if results_selector:
+                    await page.wait_for_selector(results_selector, timeout=5000)
+                else:
+                    await page.wait_for_load_state("networkidle", timeout=5000)
+            except PlaywrightTimeoutError:
+                # No result element usually means a "no results" page; fall back to the page scan
+                pass
             
+            # Extract results - state result fields when known, generic page scan otherwise -
+            # while taking the screenshot evidence if it was requested
+            captures = [page.content(), _extract_fields(page, config.get("result_selectors", {}))]
+            if screenshot:
+                captures.append(page.screenshot(full_page=False, type="jpeg", quality=60))
+            content, fields, *screenshot_bytes = await asyncio.gather(*captures)
+        
         except Exception as e:
-            await browser.close()
             raise Exception(f"Error scraping {state} license data: {str(e)}")
+        finally:
+            # Always release the context so it can't leak on the shared browser
+            if context is not None:
+                await context.close()
+    
+    # Regex scans over a full page are CPU-bound; keep them off the event loop
+    status, business_name_result, expires = await asyncio.get_running_loop().run_in_executor(
+        None, _parse_results_page, content, fields, business_name
+    )
+    
+    result = {
+        "status": status,
+        "license_number": license_number,
+        "business_name": business_name_result,
+        "issuing_authority": f"{state} {config.get('type', 'Licensing Board')}",
+        "expires": expires,
+        "verified": True,
+        "verification_url": config["url"],
+        "format_valid": validate_license_format(state, license_number)["valid"]
+    }
+    
+    if screenshot_bytes:
+        # Prefer a storage URL; embed the image only when no bucket is configured
+        screenshot_url = await upload_screenshot(screenshot_bytes[0])
+        if screenshot_url:
+            result["screenshot_url"] = screenshot_url
+        else:
+            result["screenshot_data"] = base64.b64encode(screenshot_bytes[0]).decode('utf-8')
+    
+    return result
+
+async def _warm_requests_state(config: Dict):
+    """Open a pooled keep-alive connection to a requests-mode state"""
+    async with _prewarm_semaphore:
+        await get_http_session().head(config["url"], headers=REQUEST_HEADERS)
+
+async def prewarm():
+    """Warm the HTTP pool against every requests-mode state site; failures are ignored.
+
+    Playwright states are skipped: each verification gets a fresh context that shares
+    no connections with a warmup context, and warmups would hold real requests' slots.
+    """
+    await asyncio.gather(
+        *(_warm_requests_state(config) for config in STATE_CONFIGS.values() if config["method"] == "requests"),
+        return_exceptions=True
+    )
+
+async def start_prewarm():
+    """Kick off prewarm() in the background so startup isn't held up by slow state sites"""
+    global _prewarm_task
+    if PREWARM and _prewarm_task is None:
+        _prewarm_task = asyncio.create_task(prewarm())
+
+async def stop_prewarm():
+    """Cancel a still-running prewarm so it can't reopen the HTTP session after shutdown"""
+    global _prewarm_task
+    if _prewarm_task is not None:
+        _prewarm_task.cancel()
+        try:
+            await _prewarm_task
+        except asyncio.CancelledError:
+            pass
+        _prewarm_task = None
+
+def _classify_status(text: Union[str, bytes, bytearray], patterns=STATUS_PATTERNS) -> str:
+    """Map page or status-field text to a license status"""
+    for status, pattern in patterns:
+        if pattern.search(text):
+            return status
+    return "Unknown"
+
+def _parse_detail_page(content: str, patterns: Dict[str, re.Pattern], license_number: str) -> Optional[Tuple[str, str, str]]:
+    """Get (status, business name, expiration) from a state's license detail page.
+    
+    Returns None when the page lacks the detail markers (license number and status element),
+    e.g. a search form, error page or bot challenge, so the caller can fall back.
+    """
+    fields = {}
+    for field, pattern in patterns.items():
+        match = pattern.search(content)
+        fields[field] = html.unescape(HTML_TAG_PATTERN.sub(" ", match.group(1))).strip() if match else ""
+    
+    if license_number not in fields.get("license_number", "") or not fields.get("status"):
+        return None
+    return (
+        _classify_status(fields["status"]),
+        " ".join(fields.get("business_name", "").split()) or "Unknown",
+        fields.get("expires") or "Unknown"
+    )
+
+def _parse_results_page(content: str, fields: Dict[str, Optional[str]], business_name: Optional[str] = None) -> Tuple[str, str, str]:
+    """Get (status, business name, expiration) from a results page, preferring extracted result fields"""
+    status = _classify_status(fields.get("status") or content)
+    business_name_result = business_name or fields.get("business_name") or "Unknown"
+    expires = fields.get("expires") or "Unknown"
+    
+    # Try to extract business name if not provided
+    if business_name_result == "Unknown":
+        for pattern in NAME_PATTERNS:
+            match = pattern.search(content)
+            if match:
+                business_name_result = match.group(1).strip()
+                break
+    
+    # Try to extract expiration date if the result fields didn't have it
+    if expires == "Unknown":
+        for pattern in DATE_PATTERNS:
+            match = pattern.search(content)
+            if match:
+                expires = match.group(1)
+                break
+    
+    return status, business_name_result, expires
 
 async def scrape_with_requests(state: str, config: Dict, license_number: str, business_name: Optional[str] = None) -> Dict[str, Any]:
     """HTTP requests scraping for simpler sites"""
-    async with aiohttp.ClientSession() as session:
+    session = get_http_session()
+    async with HTTP_SEM:
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate'
-            }
-            
             # Prepare form data based on state
-            if state == "FL":
-                form_data = {
-                    'licnbr': license_number,
-                    'Submit': 'Search'
-                }
-            elif state == "AR":
-                form_data = {
-                    'license_number': license_number,
-                    'search': 'Search'
-                }
-            elif state == "MD":
-                form_data = {
-                    'license_number': license_number,
-                    'action': 'search'
-                }
-            else:
-                # Generic form data
-                form_data = {
-                    'license_number': license_number,
-                    'search': 'Search'
-                }
-            
-            # Submit search request
-            async with session.post(config["url"], data=form_data, headers=headers) as response:
-                html_content = await response.text()
+            form_template, license_fields = FORM_TEMPLATES.get(state, DEFAULT_FORM_TEMPLATE)
+            form_data = dict(form_template)
+            for field in license_fields:
+                form_data[field] = form_template[field].format(license_number=license_number)
             
-            # Parse results
-            soup = BeautifulSoup(html_content, 'html.parser')
+            # Submit search request, streaming the body only until the status is settled
+            body = bytearray()
+            headers = STATE_REQUEST_HEADERS.get(state, REQUEST_HEADERS)
+            if config.get("http_method") == "GET":
+                request_stream = session.stream("GET", config["url"], params=form_data, headers=headers)
+            else:
+                request_stream = session.stream("POST", config["url"], data=form_data, headers=headers)
+            detail_patterns = STATE_DETAIL_PATTERNS.get(state)
+            # Detail fields still to arrive; reading stops once all of them have
+            pending_fields = dict(STATE_DETAIL_BYTES_PATTERNS.get(state, {}))
+            max_bytes = MAX_RESPONSE_BYTES if detail_patterns is None else MAX_DETAIL_RESPONSE_BYTES
+            async with request_stream as response:
+                charset = response.charset_encoding or "utf-8"
+                async for chunk in response.aiter_bytes(4096):
+                    if detail_patterns is None:
+                        # Rescan a little of the previous chunk in case a keyword straddles the boundary
+                        scan_from = max(0, len(body) - 32)
+                        body.extend(chunk)
+                        # Active outranks every other status, so nothing later in the page can change it
+                        if ACTIVE_BYTES_PATTERN.search(body, scan_from):
+                            break
+                    else:
+                        scan_from = max(0, len(body) - DETAIL_RESCAN_BYTES)
+                        body.extend(chunk)
+                        for field, pattern in list(pending_fields.items()):
+                            if pattern.search(body, scan_from):
+                                del pending_fields[field]
+                        if not pending_fields:
+                            break
+                    if len(body) >= max_bytes:
+                        break
             
-            # Determine status
-            status = "Unknown"
+            # The body is capped, so these scans are cheap enough to run inline
             business_name_result = business_name or "Unknown"
             expires = "Unknown"
-            
-            content_lower = html_content.lower()
-            if any(word in content_lower for word in ["active", "valid", "current"]):
-                status = "Active"
-            elif any(word in content_lower for word in ["expired", "inactive"]):
-                status = "Expired"
-            elif any(word in content_lower for word in ["invalid", "not found", "no results"]):
-                status = "Invalid"
+            if detail_patterns is None:
+                status = _classify_status(body, STATUS_BYTES_PATTERNS)
+            else:
+                detail = _parse_detail_page(bytes(body).decode(charset, errors="replace"), detail_patterns, license_number)
+                if detail is None:
+                    # Not the detail page we expected; report Unknown so the caller can fall back
+                    status = "Unknown"
+                else:
+                    status, detail_name, expires = detail
+                    business_name_result = business_name or detail_name
             
             return {
                 "status": status,
@@ -629,31 +874,56 @@ async def scrape_with_requests(state: str, config: Dict, license_number: str, bu
                 "verified": True,
                 "verification_url": config["url"],
                 "format_valid": validate_license_format(state, license_number)["valid"],
-                "raw_html_snippet": html_content[:500]  # First 500 chars for debugging
+                "raw_html_snippet": bytes(body[:500]).decode(charset, errors="replace")  # First 500 bytes for debugging
             }
             
         except Exception as e:
             raise Exception(f"Error verifying {state} license: {str(e)}")
 
-async def verify_license(state: str, license_number: Optional[str] = None, business_name: Optional[str] = None) -> Dict[str, Any]:
+async def _scrape_with_fallback(state: str, config: Dict, license_number: str, business_name: Optional[str] = None, screenshot: bool = False) -> Dict[str, Any]:
+    """Query a state's direct endpoint, driving its full search page in Playwright only when needed"""
+    # Screenshots need a rendered page, so skip straight to the browser
+    if not screenshot:
+        try:
+            result = await scrape_with_requests(state, config, license_number, business_name)
+            if result["status"] != "Unknown":
+                return result
+        except Exception as e:
+            log_verification_attempt(state, license_number, False, f"direct lookup failed, using browser: {e}")
+    
+    # Screenshot requested, or the endpoint errored or returned a page we couldn't read
+    return await scrape_with_playwright(state, {**config, "url": config["fallback_url"]}, license_number, business_name, screenshot)
+
+async def verify_license(state: str, license_number: Optional[str] = None, business_name: Optional[str] = None, screenshot: bool = False) -> Dict[str, Any]:
     """Main license verification function"""
     
     # Input validation
-    if not state:
-        raise Exception("State is required")
-    
-    if not license_number and not business_name:
-        raise Exception("Either license number or business name is required")
-    
+    _require_inputs(state, license_number, business_name)
     state = state.upper()
     
     # Check cache first
-    cache_key = f"{state}_{license_number}_{business_name}"
-    cached = get_cached_result(cache_key)
+    cache_key = make_cache_key(state, license_number, business_name, screenshot)
+    cached = await get_cached_result(cache_key)
     if cached:
         cached["from_cache"] = True
         return cached
     
+    return await _verify_license_uncached(state, license_number, business_name, cache_key, screenshot=screenshot)
+
+def _require_inputs(state: Optional[str], license_number: Optional[str], business_name: Optional[str]):
+    """Raise if a verification request is missing required fields"""
+    if not state:
+        raise Exception("State is required")
+    
+    if not license_number and not business_name:
+        raise Exception("Either license number or business name is required")
+
+async def _verify_license_uncached(state: str, license_number: Optional[str], business_name: Optional[str], cache_key: str, pending_writes: Optional[List] = None, screenshot: bool = False) -> Dict[str, Any]:
+    """Verify a license without reading the cache.
+    
+    The outcome is written to the cache immediately, or appended to pending_writes
+    as (key, result, ttl_seconds) so batch callers can write everything in one round trip.
+    """
     # Check if state is supported
     if state not in STATE_CONFIGS:
         return {
@@ -677,12 +947,34 @@ async def verify_license(state: str, license_number: Optional[str] = None, busin
                 "verified": False
             }
     
+    # Share the result of an identical verification that is already running
+    task = _inflight.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(_scrape_and_cache(state, config, cache_key, license_number, business_name, pending_writes, screenshot))
+        _inflight[cache_key] = task
+        task.add_done_callback(lambda _: _inflight.pop(cache_key, None))
+    
+    # Shield so a disconnecting caller doesn't cancel the scrape other callers are waiting on
+    return await asyncio.shield(task)
+
+def _state_slot(state: str) -> asyncio.Semaphore:
+    """Semaphore capping concurrent scrapes against one state's site"""
+    semaphore = _state_semaphores.get(state)
+    if semaphore is None:
+        semaphore = _state_semaphores[state] = asyncio.Semaphore(STATE_CONCURRENCY)
+    return semaphore
+
+async def _scrape_and_cache(state: str, config: Dict, cache_key: str, license_number: Optional[str], business_name: Optional[str], pending_writes: Optional[List] = None, screenshot: bool = False) -> Dict[str, Any]:
+    """Run the scrape for a state and cache the outcome"""
     try:
         # Choose scraping method
-        if config["method"] == "playwright":
-            result = await scrape_with_playwright(state, config, license_number, business_name)
-        else:
-            result = await scrape_with_requests(state, config, license_number, business_name)
+        async with _state_slot(state):
+            if config["method"] == "playwright":
+                result = await scrape_with_playwright(state, config, license_number, business_name, screenshot)
+            elif config.get("fallback_method") == "playwright":
+                result = await _scrape_with_fallback(state, config, license_number, business_name, screenshot)
+            else:
+                result = await scrape_with_requests(state, config, license_number, business_name)
         
         # Add state-specific information
         result["state"] = state
@@ -690,7 +982,7 @@ async def verify_license(state: str, license_number: Optional[str] = None, busin
         result["notes"] = config.get("notes")
         
         # Cache the result
-        store_result(cache_key, result)
+        await _cache_outcome(cache_key, result, CACHE_TTL_SECONDS, pending_writes)
         
         return result
         
@@ -705,49 +997,86 @@ async def verify_license(state: str, license_number: Optional[str] = None, busin
         }
         
         # Cache error results for a shorter time to allow retries
-        store_result(f"error_{cache_key}", error_result)
+        await _cache_outcome(f"error_{cache_key}", error_result, ERROR_CACHE_SECONDS, pending_writes)
         
         return error_result
 
-async def verify_batch(requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Verify multiple licenses in batch with rate limiting"""
+async def _cache_outcome(cache_key: str, result: Dict[str, Any], ttl_seconds: int, pending_writes: Optional[List] = None):
+    """Store a verification outcome now, or queue it for a batched write"""
+    if "screenshot_data" in result:
+        # Inline screenshots are large and only meaningful for this response; don't cache them
+        return
+    if pending_writes is None:
+        await store_result(cache_key, result, ttl_seconds=ttl_seconds)
+    else:
+        pending_writes.append((cache_key, result, ttl_seconds))
+
+async def _verify_batch_item(request: Any, cache_key: str, pending_writes: List) -> Dict[str, Any]:
+    """Verify one cache-missed batch entry"""
+    _require_inputs(request.state, request.license_number, request.business_name)
+    return await _verify_license_uncached(
+        request.state.upper(),
+        request.license_number,
+        request.business_name,
+        cache_key,
+        pending_writes,
+        screenshot=request.screenshot
+    )
+
+async def verify_batch(requests: List[Any]) -> List[Dict[str, Any]]:
+    """Verify multiple licenses in batch concurrently.
     
-    # Group requests by state to optimize scraping
-    state_groups = {}
-    for i, request in enumerate(requests):
-        state = request.get("state", "").upper()
-        if state not in state_groups:
-            state_groups[state] = []
-        state_groups[state].append((i, request))
+    Each request is read by attribute (state, license_number, business_name, screenshot),
+    so LicenseRequest models can be passed straight through without converting to dicts.
+    """
     
     results = [None] * len(requests)
     
-    # Process each state group with appropriate delays
-    for state, state_requests in state_groups.items():
-        for i, (original_index, request) in enumerate(state_requests):
-            try:
-                # Add delay between requests to avoid overwhelming servers
-                if i > 0:
-                    await asyncio.sleep(2)  # 2 second delay between requests to same state
-                
-                result = await verify_license(
-                    request.get("state"),
-                    request.get("license_number"),
-                    request.get("business_name")
-                )
-                results[original_index] = result
-                
-            except Exception as e:
-                results[original_index] = {
-                    "status": "Error",
-                    "message": str(e),
-                    "license_number": request.get("license_number"),
-                    "state": request.get("state"),
-                    "verified": False
-                }
-        
-        # Add longer delay between different states
-        await asyncio.sleep(1)
+    # Look up every request in the cache with a single round trip
+    cache_keys = [
+        make_cache_key(
+            (request.state or "").upper(),
+            request.license_number,
+            request.business_name,
+            request.screenshot
+        )
+        for request in requests
+    ]
+    cached_results = await get_cached_results(cache_keys)
+    
+    misses = []
+    for i, (request, cached) in enumerate(zip(requests, cached_results)):
+        if cached:
+            cached["from_cache"] = True
+            results[i] = cached
+        else:
+            misses.append(i)
+    
+    pending_writes = []
+    
+    # Scrape misses concurrently in chunks so at most BATCH_CHUNK verifications are alive at once
+    miss_results = []
+    for start in range(0, len(misses), BATCH_CHUNK):
+        chunk = misses[start:start + BATCH_CHUNK]
+        miss_results.extend(await asyncio.gather(
+            *(_verify_batch_item(requests[i], cache_keys[i], pending_writes) for i in chunk),
+            return_exceptions=True
+        ))
+    
+    for i, result in zip(misses, miss_results):
+        if isinstance(result, Exception):
+            request = requests[i]
+            result = {
+                "status": "Error",
+                "message": str(result),
+                "license_number": request.license_number,
+                "state": request.state,
+                "verified": False
+            }
+        results[i] = result
+    
+    # Write all new results back in one pipelined round trip
+    await store_results(pending_writes)
     
     return results
 
@@ -778,15 +1107,13 @@ async def parse_california_results(page) -> Dict[str, Any]:
     """Parse California CSLB specific results"""
     try:
         # Look for specific CSLB result elements
-        status_element = await page.query_selector(".license-status, #license-status")
-        name_element = await page.query_selector(".contractor-name, #contractor-name")
-        expires_element = await page.query_selector(".expiration-date, #expiration-date")
-        
-        status = await status_element.text_content() if status_element else "Unknown"
-        name = await name_element.text_content() if name_element else "Unknown"
-        expires = await expires_element.text_content() if expires_element else "Unknown"
+        fields = await _extract_fields(page, STATE_CONFIGS["CA"]["result_selectors"])
         
-        return {"status": status, "name": name, "expires": expires}
+        return {
+            "status": fields["status"] or "Unknown",
+            "name": fields["business_name"] or "Unknown",
+            "expires": fields["expires"] or "Unknown"
+        }
     except:
         return {"status": "Unknown", "name": "Unknown", "expires": "Unknown"}
 
@@ -794,15 +1121,7 @@ async def parse_florida_results(page) -> Dict[str, Any]:
     """Parse Florida DBPR specific results"""
     try:
         # Florida typically shows results in a table format
-        rows = await page.query_selector_all("tr")
-        license_data = {}
-        
-        for row in rows:
-            cells = await row.query_selector_all("td")
-            if len(cells) >= 2:
-                label = await cells[0].text_content()
-                value = await cells[1].text_content()
-                license_data[label.lower().strip()] = value.strip()
+        license_data = await page.evaluate(EXTRACT_TABLE_JS)
         
         status = license_data.get("status", "Unknown")
         name = license_data.get("business name", license_data.get("name", "Unknown"))
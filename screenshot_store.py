@@ -0,0 +1,64 @@
+import asyncio
+import os
+from typing import Optional
+from uuid import uuid4
+
+try:
+    import aioboto3
+except ImportError:  # S3 upload is optional; screenshots are returned inline instead
+    aioboto3 = None
+
+# Screenshots go to S3 when SCREENSHOT_BUCKET is set, so responses carry a URL instead of image bytes
+SCREENSHOT_BUCKET = os.getenv("SCREENSHOT_BUCKET")
+SCREENSHOT_PREFIX = "screenshots/"
+# Public base URL for uploaded screenshots (e.g. a CDN or public-read bucket).
+# Without one the bucket is treated as private and a presigned URL is returned instead.
+SCREENSHOT_BASE_URL = os.getenv("SCREENSHOT_BASE_URL")
+# Presigned URLs outlive the 24h result cache that stores them (7 days is the SigV4 maximum)
+SCREENSHOT_URL_EXPIRES = int(os.getenv("SCREENSHOT_URL_EXPIRES", str(7 * 24 * 3600)))
+
+if SCREENSHOT_BUCKET and aioboto3 is None:
+    print("SCREENSHOT_BUCKET is set but aioboto3 is not installed; screenshots will be returned inline")
+
+_session = aioboto3.Session() if (SCREENSHOT_BUCKET and aioboto3) else None
+_client_cm = None
+_client = None
+_client_lock = asyncio.Lock()
+
+async def _get_client():
+    """Open the S3 client on first use and keep it for the life of the process"""
+    global _client_cm, _client
+    if _client is None:
+        async with _client_lock:
+            if _client is None:
+                _client_cm = _session.client("s3")
+                _client = await _client_cm.__aenter__()
+    return _client
+
+async def close_screenshot_store():
+    """Close the S3 client at app shutdown"""
+    global _client_cm, _client
+    if _client_cm is not None:
+        await _client_cm.__aexit__(None, None, None)
+        _client_cm = None
+        _client = None
+
+async def upload_screenshot(image_bytes: bytes) -> Optional[str]:
+    """Upload a JPEG screenshot and return its URL, or None if storage isn't configured or the upload failed"""
+    if _session is None:
+        return None
+
+    key = f"{SCREENSHOT_PREFIX}{uuid4()}.jpg"
+    try:
+        s3 = await _get_client()
+        await s3.put_object(Bucket=SCREENSHOT_BUCKET, Key=key, Body=image_bytes, ContentType="image/jpeg")
+        if not SCREENSHOT_BASE_URL:
+            return await s3.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": SCREENSHOT_BUCKET, "Key": key},
+                ExpiresIn=SCREENSHOT_URL_EXPIRES
+            )
+    except Exception as e:
+        print(f"Error uploading screenshot: {e}")
+        return None
+    return f"{SCREENSHOT_BASE_URL.rstrip('/')}/{key}"